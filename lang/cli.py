@@ -1,9 +1,9 @@
 """This module provides the fikl CLI."""
+# pylint: disable=import-outside-toplevel
 # lang/cli.py
 
 import os.path
 import os
-import atexit
 import readline
 import firebase_admin
 
@@ -11,10 +11,6 @@ import typer
 from typing_extensions import Annotated
 from rich import print as rprint, print_json
 
-from lang import ql
-
-from lang.transformer import (FIKLFormatType)
-
 app = typer.Typer(rich_markup_mode="rich")
 
 QUERY_COMMAND_HELP = "The query to execute against the Firestore database."
@@ -25,20 +21,23 @@ PROGRESS_HOLDER = {"progress": None}
 def query(query_text: Annotated[(str), typer.Argument(help=QUERY_COMMAND_HELP)] = None):
     """
     Typer command handler to handle the query command.
+    The query module is only imported once it is needed so that the REPL starts quickly.
     """
-    try:
-        if (env_var := 'GOOGLE_APPLICATION_CREDENTIALS') not in os.environ:
-            rprint(
-                f"""[italic yellow]Warning: {env_var} is not set[/italic yellow]""")
+    if (env_var := 'GOOGLE_APPLICATION_CREDENTIALS') not in os.environ:
+        rprint(
+            f"""[italic yellow]Warning: {env_var} is not set[/italic yellow]""")
 
-        configure_firebase()
+    configure_firebase()
 
-        if query_text is None:
-            start_repl()
-        else:
+    if query_text is None:
+        start_repl()
+    else:
+        from lang import ql
+
+        try:
             run_query_and_output(query_text)
-    except ql.QueryError as exception:
-        typer.echo(exception)
+        except ql.QueryError as exception:
+            typer.echo(exception)
 
 
 def configure_firebase():
@@ -50,6 +49,9 @@ def run_query_and_output(query_text):
     """
     Runs the supplied query and outputs the results.
     """
+    from lang import ql
+    from lang.transformer import FIKLFormatType
+
     results = ql.run_query(query_text)
 
     output_fn = rprint if results[1] == FIKLFormatType.CSV else print_json
@@ -63,14 +65,16 @@ def start_repl():
 
     history_path = os.path.expanduser("~/.fikl_history")
 
-    def save_history(history_path=history_path):
-        readline.write_history_file(history_path)
+    readline.set_history_length(100)
 
-    if os.path.exists(history_path):
-        readline.set_history_length(100)
-        readline.read_history_file(history_path)
-
-    atexit.register(save_history)
+    try:
+        if os.path.exists(history_path):
+            readline.read_history_file(history_path)
+        else:
+            readline.write_history_file(history_path)
+    except OSError as exception:
+        rprint(f"[italic yellow]Warning: history will not be saved ({exception})[/italic yellow]")
+        history_path = None
 
     readline.parse_and_bind("tab: complete")
     readline.parse_and_bind("set editing-mode vi")
@@ -78,26 +82,43 @@ def start_repl():
     rprint("[italic pink]FIKL Repl[/italic pink] :fire:")
     rprint("[italic blue]type `exit` to quit[/italic blue]")
 
-    current_query: str = None
+    query_parts: list[str] = []
 
     while go_again:
 
-        if current_query is None or current_query.strip() == "":
-            current_query = input('> ').strip()
-        else:
-            current_query = f"{current_query} {input(': ')}".strip()
+        if not query_parts:
+            query_history_start = readline.get_current_history_length()
+
+        line = input(': ' if query_parts else '> ').strip()
 
-        if current_query == "exit":
+        if not query_parts and line == "exit":
             go_again = False
             rprint("Bye!:waving_hand:")
-        elif current_query == "cls":
+        elif not query_parts and line == "cls":
             typer.clear()
-            current_query = None
-        elif current_query.endswith(';'):
-            try:
-                run_query_and_output(current_query[:-1])
-            except ql.QueryError as exception:
-                rprint("[italic red]Query Error[/italic red] :exploding_head:")
-                rprint(exception)
-            finally:
-                current_query = None
+        elif line != "":
+            query_parts.append(line)
+
+            if line.endswith(';'):
+                from lang import ql
+
+                # Only the history entries readline added for the submitted query are
+                # appended to the history file, which is then truncated to the history length.
+                if history_path is not None:
+                    query_history_length = (readline.get_current_history_length()
+                                            - query_history_start)
+                    try:
+                        readline.append_history_file(query_history_length, history_path)
+                    except OSError as exception:
+                        rprint("[italic yellow]Warning: history will not be saved "
+                               f"({exception})[/italic yellow]")
+                        history_path = None
+
+                current_query = " ".join(query_parts)
+                query_parts = []
+
+                try:
+                    run_query_and_output(current_query[:-1])
+                except ql.QueryError as exception:
+                    rprint("[italic red]Query Error[/italic red] :exploding_head:")
+                    rprint(exception)
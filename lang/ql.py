@@ -30,7 +30,8 @@ from lang.transformer import (FIKLQuery,
                               FIKLSubjectType,
                               FIKLOutputType,
                               FIKLFormatType,
-                              FIKLUpdateQuery, parse)
+                              FIKLUpdateQuery,
+                              FIKLUpdateSet, parse)
 
 
 class QueryError(ValueError):
@@ -44,7 +45,7 @@ class QueryError(ValueError):
 
 def should_output(fikl_query: FIKLQuery) -> bool:
     "Indicates if the output of the query should be saved to a file"
-    return "output_type" in fikl_query and object_exists(fikl_query["output_type"])
+    return isinstance(fikl_query, FIKLSelectQuery) and object_exists(fikl_query.output_type)
 
 
 def run_query(query: str) -> tuple[list[dict] | dict, FIKLFormatType]:
@@ -86,7 +87,10 @@ def run_query(query: str) -> tuple[list[dict] | dict, FIKLFormatType]:
 
 def format_as(fikl_query: FIKLSelectQuery) -> FIKLFormatType:
     """Determines the appropriate format to use for the query results."""
-    return FIKLFormatType.CSV if fikl_query["format"] == FIKLFormatType.CSV else FIKLFormatType.JSON
+    if isinstance(fikl_query, FIKLSelectQuery) and fikl_query.format == FIKLFormatType.CSV:
+        return FIKLFormatType.CSV
+
+    return FIKLFormatType.JSON
 
 def output_as(dictionary, file_type: FIKLFormatType):
     """Converts the provided dictionary to the output format."""
@@ -104,15 +108,15 @@ def csv_dumps(records: list):
 
 def output_content(output_data: str, fikl_query: FIKLSelectQuery):
     """ Writes the provided json to the provided path."""
-    if fikl_query["output_type"] == FIKLOutputType.PATH:
-        path = fikl_query["output"]
+    if fikl_query.output_type == FIKLOutputType.PATH:
+        path = fikl_query.output
         full_path = os.path.expanduser(path)
         with open(full_path, "w", encoding="utf-8") as file:
             file.write(output_data)
 
         return full_path
 
-    if fikl_query["output_type"] == FIKLOutputType.CLIPBOARD:
+    if fikl_query.output_type == FIKLOutputType.CLIPBOARD:
         pyperclip.copy(output_data)
         return "clipboard"
 
@@ -121,8 +125,8 @@ def output_content(output_data: str, fikl_query: FIKLSelectQuery):
 
 def do_group_by(records, fikl_query: FIKLSelectQuery):
     """Groups records by the provided group property."""
-    if "group" in fikl_query and fikl_query["group"]:
-        return pydash.group_by(records, fikl_query["group"])
+    if isinstance(fikl_query, FIKLSelectQuery) and fikl_query.group:
+        return pydash.group_by(records, fikl_query.group)
 
     return records
 
@@ -130,8 +134,8 @@ def do_group_by(records, fikl_query: FIKLSelectQuery):
 def function_for_query(fikl_query: FIKLSelectQuery):
     """Determines the appropriate function to use for the query results."""
 
-    if "function" in fikl_query:
-        match fikl_query["function"]:
+    if isinstance(fikl_query, FIKLSelectQuery):
+        match fikl_query.function:
             case "count":
                 return len
             case "distinct":
@@ -140,7 +144,7 @@ def function_for_query(fikl_query: FIKLSelectQuery):
     return lambda x: x
 
 
-def merge_setters(dicts: list[dict]) -> dict:
+def merge_setters(setters: tuple[FIKLUpdateSet, ...]) -> dict:
     """
     Merges a list of setter values into a single dict.
 
@@ -148,8 +152,8 @@ def merge_setters(dicts: list[dict]) -> dict:
         dict: The dict with the setters.
     """
     result = {}
-    for setter in dicts:
-        result.update({setter["property"]: setter["value"]})
+    for setter in setters:
+        result.update({setter.property: setter.value})
     return result
 
 
@@ -199,7 +203,7 @@ def merge_dicts(dicts) -> dict:
     return dict(result)
 
 
-def extract_fields(obj: dict | None, fields: list[str]) -> dict:
+def extract_fields(obj: dict | None, fields: list[str] | tuple[str, ...]) -> dict:
     """
     Returns only fields from the provided object that are in the provided list of fields.
 
@@ -248,7 +252,7 @@ def snapshot_to_document_fn(fikl_query: FIKLQuery):
     Returns:
         The function that can be called to convert a DocumentSnapshot to a dictionary.
     """
-    requested_fields = fikl_query["fields"] if "fields" in fikl_query else "*"
+    requested_fields = fikl_query.fields if isinstance(fikl_query, FIKLSelectQuery) else "*"
 
     def extract_fields_from_snapshot(response: fs.firestore.DocumentSnapshot | str):
         if isinstance(response, str):
@@ -273,13 +277,13 @@ def add_order_by_clauses(query: fs.firestore.Query,
     Returns:
         firestore.Query: The query with the order by clauses added.
     """
-    if "order" in fikl_query and fikl_query["order"] is not None:
-        remote_orders = [where for where in fikl_query["order"]
-                         if where["local"] is False]
+    if isinstance(fikl_query, FIKLSelectQuery) and fikl_query.order is not None:
+        remote_orders = [where for where in fikl_query.order
+                         if where.local is False]
         for order in remote_orders:
-            direction = "ASCENDING" if order["direction"] == "asc" else "DESCENDING"
+            direction = "ASCENDING" if order.direction == "asc" else "DESCENDING"
             query = query.order_by(
-                order["property"], direction=direction)
+                order.property, direction=direction)
         return query
 
     return query
@@ -293,20 +297,20 @@ def add_where_clauses(query: fs.firestore.Query,
     Returns:
         firestore.Query: The query with the where clauses added.
     """
-    if fikl_query["where"] is not None:
-        remote_wheres = [where for where in fikl_query["where"]
-                         if where["local"] is False]
+    if fikl_query.where is not None:
+        remote_wheres = [where for where in fikl_query.where
+                         if where.local is False]
         for where in remote_wheres:
-            corrected_operator = "not-in" if where["operator"] == "not_in" else where["operator"]
+            corrected_operator = "not-in" if where.operator == "not_in" else where.operator
 
             if corrected_operator == "like":
                 error_message = ("The 'like' operator is not supported by Firestore. "
                                  "Use local evaluation by placing ^ after the property name. "
-                                 f"Did you mean {where['property']}^ ?")
+                                 f"Did you mean {where.property}^ ?")
                 raise QueryError(error_message)
 
             field_filter = FieldFilter(
-                where["property"], corrected_operator, where["value"])
+                where.property, corrected_operator, where.value)
 
             query = query.where(filter=field_filter)
         return query
@@ -324,7 +328,7 @@ def execute_query(fikl_query: FIKLQuery) -> list[fs.firestore.DocumentSnapshot]
     """
 
     def fn_for_query(fikl_query: FIKLQuery):
-        match fikl_query["query_type"]:
+        match fikl_query.query_type:
             case FIKLQueryType.SELECT:
                 return execute_select_query
             case FIKLQueryType.UPDATE:
@@ -377,7 +381,7 @@ def execute_update_query(fikl_query: FIKLUpdateQuery) -> int:
     docs = execute_select_query(fikl_query)
 
     count = 0
-    new_values = merge_setters(fikl_query["set"])
+    new_values = merge_setters(fikl_query.set)
 
     if len(docs) > 0:
         with typer.progressbar(label="Updating", length=len(docs)) as progress:
@@ -399,7 +403,7 @@ def execute_insert_query(fikl_query: FIKLInsertQuery) -> int:
     Returns:
         int: The number of documents inserted.
     """
-    new_values = merge_setters(fikl_query["set"])
+    new_values = merge_setters(fikl_query.set)
 
     dicts = [expand_key({}, key, value)
              for key, value in new_values.items()]
@@ -407,8 +411,8 @@ def execute_insert_query(fikl_query: FIKLInsertQuery) -> int:
 
     client = fs.client()
 
-    client.collection(fikl_query["subject"]).add(
-        merged_dict, document_id=fikl_query["identifier"])
+    client.collection(fikl_query.subject).add(
+        merged_dict, document_id=fikl_query.identifier)
     return 1
 
 
@@ -422,8 +426,8 @@ def execute_show_query(fikl_query: FIKLSelectQuery) -> list[str]:
     client = fs.client()
     colls = []
 
-    collections_fn = client.collections if fikl_query["subject"] is None else client.document(
-        fikl_query["subject"]).collections
+    collections_fn = client.collections if fikl_query.subject is None else client.document(
+        fikl_query.subject).collections
 
     for coll in collections_fn():
         colls.append(coll.id)
@@ -444,29 +448,29 @@ def local_compare(document: dict, prop: str, where: FIKLWhere) -> bool:
         return False
 
     value = document[prop]
-    match where['operator']:
+    match where.operator:
         case ">":
-            return value > where['value']
+            return value > where.value
         case ">=":
-            return value >= where['value']
+            return value >= where.value
         case "<":
-            return value < where['value']
+            return value < where.value
         case "<=":
-            return value <= where['value']
+            return value <= where.value
         case "!=":
-            return value != where['value']
+            return value != where.value
         case "==":
-            return value == where['value']
+            return value == where.value
         case "in":
-            return value in where['value']
+            return value in where.value
         case "not_in":
-            return value not in where['value']
+            return value not in where.value
         case "array_contains":
-            return where['value'] in value
+            return where.value in value
         case "array_contains_any":
-            return pydash.every(where['value'], lambda v: v in value)
+            return pydash.every(where.value, lambda v: v in value)
         case "like":
-            regex = like_to_regex(where['value'])
+            regex = like_to_regex(where.value)
             return re.search(regex, value) is not None
 
     return False
@@ -478,15 +482,15 @@ def includes(document: dict, local_filters: list[FIKLWhere]) -> bool:
     """
     flat_dict = flatten(document)
     return pydash.every(local_filters,
-                        lambda where: local_compare(flat_dict, where["property"], where))
+                        lambda where: local_compare(flat_dict, where.property, where))
 
 
 def filter_locally(records: list[fs.firestore.DocumentSnapshot],
                    fikl_query: FIKLSelectQuery):
     """Filters the list of records locally."""
-    if fikl_query["where"] is not None:
+    if fikl_query.where is not None:
         local_wheres = [
-            where for where in fikl_query["where"] if where["local"] is True]
+            where for where in fikl_query.where if where.local is True]
         return [doc for doc in records if includes(doc.to_dict(), local_wheres)]
 
     return records
@@ -519,14 +523,14 @@ def multikeysort(items, columns):
 
 def order_by_as_sort_column(order_by: FIKLOrderBy) -> str:
     """Creates a new sort column from the provided order by clause."""
-    return order_by["property"] if order_by["direction"] == "asc" else f"-{order_by['property']}"
+    return order_by.property if order_by.direction == "asc" else f"-{order_by.property}"
 
 
 def sort_locally(records: list[fs.firestore.DocumentSnapshot], fikl_query: FIKLSelectQuery):
     """Sorts the list of records locally."""
-    if "order" in fikl_query and fikl_query["order"] is not None:
+    if isinstance(fikl_query, FIKLSelectQuery) and fikl_query.order is not None:
         sorters = [order_by_as_sort_column(order_by)
-                   for order_by in fikl_query["order"]]
+                   for order_by in fikl_query.order]
         return multikeysort(records, sorters)
     return records
 
@@ -545,15 +549,15 @@ def execute_select_query(fikl_query: FIKLSelectQuery) -> list[fs.firestore.Docum
         query = add_where_clauses(query, fikl_query)
         query = add_order_by_clauses(query, fikl_query)
 
-        if "limit" in fikl_query and fikl_query["limit"] is not None:
-            query = query.limit(fikl_query["limit"])
+        if isinstance(fikl_query, FIKLSelectQuery) and fikl_query.limit is not None:
+            query = query.limit(fikl_query.limit)
 
         return sort_locally(filter_locally(query.get(), fikl_query), fikl_query)
 
-    match fikl_query["subject_type"]:
+    match fikl_query.subject_type:
         case FIKLSubjectType.COLLECTION_GROUP:
-            return execute_collection_query(client.collection_group(fikl_query["subject"]))
+            return execute_collection_query(client.collection_group(fikl_query.subject))
         case FIKLSubjectType.COLLECTION:
-            return execute_collection_query(client.collection(fikl_query["subject"]))
+            return execute_collection_query(client.collection(fikl_query.subject))
         case FIKLSubjectType.DOCUMENT:
-            return [client.document(fikl_query["subject"]).get()]
+            return [client.document(fikl_query.subject).get()]
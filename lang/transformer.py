@@ -1,17 +1,50 @@
 """transformer for lark processing."""
-# pylint: disable=too-many-arguments
+# pylint: disable=too-many-arguments,too-many-public-methods
 import ast
 import os
 import sys
 
+from functools import lru_cache
+from dataclasses import dataclass
 from enum import Enum
-from typing import TypedDict
 from typing import Union
-from lark import Lark, Transformer, v_args, Tree
+from lark import Lark, Transformer, v_args, Token
+from lark.exceptions import LarkError
+
+from lang._grammar import GRAMMAR
 
 AllTypes = Union[int, float, str, bool, None]
 
 
+def _as_number(value: str) -> int | float:
+    """Converts a NUMBER or SIGNED_NUMBER token value to an int, or a float when not integral."""
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def _as_string(value: str) -> str:
+    """Converts an ESCAPED_STRING token value to a str, only unescaping it when required."""
+    if "\\" in value:
+        try:
+            return ast.literal_eval(value)
+        except (SyntaxError, ValueError) as err:
+            raise QuerySyntaxError(err) from err
+    return value[1:-1]
+
+
+_CONVERTERS = {
+    "CNAME": str,
+    "ESCAPED_STRING": _as_string,
+    "NUMBER": _as_number,
+    "SIGNED_NUMBER": _as_number,
+    "NULL": lambda _: None,
+    "TRUE": lambda _: True,
+    "FALSE": lambda _: False
+}
+
+
 class QuerySyntaxError(Exception):
     """Raised when the syntax of the query is invalid."""
 
@@ -42,54 +75,69 @@ class FIKLOutputType(Enum):
     CLIPBOARD = 2
 
 
-class FIKLWhere(TypedDict):
+_SUBJECT_TYPES = {
+    "WITHIN": FIKLSubjectType.COLLECTION_GROUP,
+    "FROM": FIKLSubjectType.COLLECTION,
+    "AT": FIKLSubjectType.DOCUMENT
+}
+
+
+@dataclass(slots=True, frozen=True)
+class FIKLWhere:
     """The defniition of a where clause."""
     property: str
     operator: str
-    value: int | float | str | list[any]
+    value: AllTypes | tuple[AllTypes, ...]
     local: bool
 
 
-class FIKLQuery(TypedDict):
+@dataclass(slots=True, frozen=True)
+class FIKLQuery:
     """The definition of a query. This is the base definition for all queries."""
     query_type: FIKLQueryType
     subject: str | None
     subject_type: FIKLSubjectType
-    where: list[FIKLWhere] | None
+    where: tuple[FIKLWhere, ...] | None
 
 
-class FIKLOrderBy(TypedDict):
+@dataclass(slots=True, frozen=True)
+class FIKLOrderBy:
     """The definition of a order by that is used when selecting a Firestore record."""
     property: str
     direction: str | None
     local: bool
 
 
-class FIKLUpdateSet(TypedDict):
+@dataclass(slots=True, frozen=True)
+class FIKLUpdateSet:
     """The definition of a setter that is used when updating a Firestore record."""
     property: str
     value: AllTypes
 
 
+@dataclass(slots=True, frozen=True)
 class FIKLUpdateQuery(FIKLQuery):
     """The definition of an update query."""
-    set: list[FIKLUpdateSet]
+    set: tuple[FIKLUpdateSet, ...]
 
 
+@dataclass(slots=True, frozen=True)
 class FIKLInsertQuery(FIKLQuery):
     """The definition of an insert query."""
-    set: list[FIKLUpdateSet]
-    identifier: str
+    set: tuple[FIKLUpdateSet, ...]
+    identifier: str | None
 
 
+@dataclass(slots=True, frozen=True)
 class FIKLSelectQuery(FIKLQuery):
     """The definition of a select query."""
-    fields: list[str] | str
+    fields: tuple[str, ...] | str
     limit: int | None
     output_type: FIKLOutputType | None
     output: str | None
-    order: list[FIKLOrderBy] | None
+    order: tuple[FIKLOrderBy, ...] | None
     group: str | None
+    format: FIKLFormatType | None
     function: str | None
 
 
@@ -97,285 +145,265 @@ class FIKLSelectQuery(FIKLQuery):
 class FIKLTree(Transformer):
     """The transformer class that is used to transform the Lark parse tree into a FIKLQuery."""
 
-    def __init__(self):
-        super().__init__()
-        self.vars = {}
-
-    def _data_value(self, some_tree: Tree, data: str):
-        """Gets the value of a data node."""
-        data_tree: list[Tree] = list(some_tree.find_data(data))
-        return data_tree[0].children[0].value
-
-    def _as_value(self, some_tree: Tree) -> AllTypes:
-        """
-        Gets the value of a node. Depending on the type of the node
-        the Python AST will be invoked to convert the value to the appropriate type.
-        """
-        match some_tree.children[0].type:
-            case "CNAME":
-                return some_tree.children[0].value
-            case "NULL":
-                return None
-            case "DESC":
-                return some_tree.children[0].value
-            case "ASC":
-                return some_tree.children[0].value
-            case _:
-                return ast.literal_eval(some_tree.children[0].value)
-
-    def _as_fikl_match(self, tree: Tree, prop: str) -> AllTypes | list[AllTypes] | None:
+    def __default_token__(self, token: Token) -> Token | AllTypes:
         """
-        Gets the value of a match node.
-        Depending on the type of the node, the Python AST will be invoked to
-        convert the value to the appropriate type.
+        Converts value tokens (names, strings, numbers and keywords such as null) to
+        their Python value as they are visited. All other tokens are left as is.
         """
-        matching = list(tree.find_data(prop))[0].children[0]
+        if (converter := _CONVERTERS.get(token.type)) is None:
+            return token
+        return converter(token.value)
 
-        if matching.data == 'literal':
-            if (value := self._data_value(matching, 'literal')) == 'null':
-                return None
+    def property(self, name: str) -> str:
+        """Gets the name of the property that is referenced in the query."""
+        return name
 
-            if (value := self._data_value(matching, 'literal')) == 'true':
-                return True
+    def subject(self, name: str) -> str:
+        """Gets the subject (collection, collection group or document) of the query."""
+        return name
 
-            if (value := self._data_value(matching, 'literal')) == 'false':
-                return False
+    def literal(self, value: AllTypes) -> AllTypes:
+        """Gets the value of a literal."""
+        return value
 
-            return ast.literal_eval(value)
+    def array(self, *literals: AllTypes) -> tuple[AllTypes, ...]:
+        """Gets the values of an array literal."""
+        return literals
 
-        if matching.data == "array":
-            return [ast.literal_eval(token.children[0].value)
-                    for token in list(matching.find_data("literal"))]
+    def matching(self, value: AllTypes | tuple[AllTypes, ...]) -> AllTypes | tuple[AllTypes, ...]:
+        """Gets the value that a property is matched or set against."""
+        return value
 
-        return None
+    def operator(self, token: Token) -> str:
+        """Gets the comparison operator of a where clause."""
+        return token.value
 
-    def _as_limit(self, limit: Tree | None) -> list[FIKLWhere] | None:
-        """Gets the limit value that is specified in the query."""
-        if limit is None:
-            return None
-        return self._as_value(limit)
+    def local(self, _token: Token) -> bool:
+        """Indicates that the clause should be evaluated locally."""
+        return True
+
+    def comparrison(self, prop: str, local: bool | None, operator: str,
+                    value: AllTypes | tuple[AllTypes, ...]) -> FIKLWhere:
+        """Gets a single comparison of a where clause."""
+        return FIKLWhere(property=prop, operator=operator, value=value,
+                         local=local is not None)
 
-    def _as_output(self, output: Tree | None) -> list[FIKLWhere] | None:
-        """Gets the output value that is specified in the query."""
-        if output is None or output.data != "output":
-            return None
+    def where(self, *comparrisons: FIKLWhere) -> tuple[FIKLWhere, ...]:
+        """Gets the where clause that is specified in the query."""
+        return comparrisons
 
-        return self._as_value(output)
+    def setter(self, prop: str, value: AllTypes | tuple[AllTypes, ...]) -> FIKLUpdateSet:
+        """Gets a single setter of an update or insert query."""
+        return FIKLUpdateSet(property=prop, value=value)
 
-    def _as_output_type(self, output: Tree | None) -> FIKLOutputType | None:
-        """Gets the output type that is specified in the query."""
-        if output is None:
-            return None
+    def set(self, *setters: FIKLUpdateSet) -> tuple[FIKLUpdateSet, ...]:
+        """Gets the setters that are specified in the query."""
+        return setters
 
-        return FIKLOutputType.PATH if output.data == "output" else FIKLOutputType.CLIPBOARD
+    def direction(self, token: Token) -> str:
+        """Gets the direction of an order by instruction."""
+        return token.value
 
-    def _as_format(self, output_format: Tree | None) -> FIKLFormatType | None:
-        """Gets the format type that is specified in the query."""
-        if output_format is None:
-            return None
+    def sorter(self, prop: str, local: bool | None, direction: str | None) -> FIKLOrderBy:
+        """Gets a single order by instruction."""
+        return FIKLOrderBy(property=prop, direction="asc" if direction is None else direction,
+                           local=local is not None)
 
-        format_value = self._data_value(output_format, "format")
-        return FIKLFormatType.CSV if format_value == "csv" else FIKLFormatType.JSON
+    def order(self, *sorters: FIKLOrderBy) -> tuple[FIKLOrderBy, ...]:
+        """Gets the order by instructions for the select query"""
+        return sorters
+
+    def limit(self, value: int) -> int:
+        """Gets the limit value that is specified in the query."""
+        return value
 
-    def _as_function(self, function: Tree | None) -> str | None:
+    def group(self, prop: str) -> str:
+        """Gets the group by field that is specified in the query."""
+        return prop
+
+    def function(self, token: Token) -> str:
         """Gets the function value that is specified in the query."""
-        if function is None:
-            return None
-        return self._data_value(function, "function")
+        return token.value
 
-    def _as_where(self, where: Tree | None) -> list[FIKLWhere] | None:
-        """Gets the where clause that is specified in the query."""
-        if where is None:
-            return None
-
-        def token_as_where(token) -> FIKLWhere:
-            matching = list(token.find_data("property"))[0]
-            use_local = len(list(token.find_data("local"))) > 0
-            return {
-                'property': self._as_value(matching),
-                'operator': self._data_value(token, "operator"),
-                'value': self._as_fikl_match(token, "matching"),
-                'local': use_local
-            }
-
-        return [token_as_where(token) for token in list(where.find_data("comparrison"))]
-
-    def _as_identifier(self, identifier: Tree):
-        """Gets the identifier that is specified in the query."""
-        if identifier is None:
-            return None
+    def format(self, token: Token) -> FIKLFormatType:
+        """Gets the format type that is specified in the query."""
+        return FIKLFormatType.CSV if token.value == "csv" else FIKLFormatType.JSON
 
-        return self._as_value(list(identifier.find_data("property"))[0])
+    def output_format(self, output_format: FIKLFormatType) -> FIKLFormatType:
+        """Gets the output format that is specified in the query."""
+        return output_format
 
-    def _as_setters(self, setter: Tree) -> list[FIKLUpdateSet]:
-        """Gets the setters that are specified in the query."""
-        def as_setter(token: Tree):
-            matching = list(token.find_data("property"))[0]
-            return {
-                "property": self._as_value(matching),
-                "value": self._as_fikl_match(token, "matching")
-            }
-        return [as_setter(token) for token in list(setter.find_data("setter"))]
-
-    def _as_fields(self, select: Tree) -> list[str]:
-        """Gets the fields that are specified in the query."""
-        if select.children[0].data.value == "fields":
-            values = [self._as_value(tree) for tree in list(
-                select.children[0].find_data("property"))]
-            return values
+    def output(self, path: str) -> tuple[FIKLOutputType, str]:
+        """Gets the path that the query results should be written to."""
+        return (FIKLOutputType.PATH, path)
 
+    def copy(self, _token: Token) -> tuple[FIKLOutputType, None]:
+        """Indicates that the query results should be copied to the clipboard."""
+        return (FIKLOutputType.CLIPBOARD, None)
+
+    def all(self, _token: Token) -> str:
+        """Indicates that all the fields should be selected."""
         return "*"
 
-    def _as_group(self, group: Tree | None) -> str:
-        """Gets the group by fields that are specified in the query."""
-        if group is None:
-            return None
+    def fields(self, *props: str) -> tuple[str, ...]:
+        """Gets the fields that are specified in the query."""
+        return props
 
-        return self._data_value(group, "property")
+    def subset(self, fields: tuple[str, ...] | str) -> tuple[str, ...] | str:
+        """Gets the subset of fields that should be selected."""
+        return fields
 
-    def _as_order(self, order: Tree | None) -> list[FIKLOrderBy] | None:
-        """Gets the order by instructions for the select query"""
-        if order is None:
-            return None
-
-        def as_order_by(token: Tree):
-            matching = list(token.find_data("property"))[0]
-            direction = list(token.find_data("direction"))
-            use_local = len(list(token.find_data("local"))) > 0
-
-            return {
-                "property": self._as_value(matching),
-                "direction": "asc" if len(direction) == 0 else self._as_value(direction[0]),
-                "local": use_local
-            }
-
-        return [as_order_by(token) for token in list(order.find_data("sorter"))]
-
-    def _as_subject_type(self, subject_type: Tree):
-        """Determines the subject type that the query is referring to."""
-        match subject_type.children[0].type:
-            case "WITHIN":
-                return FIKLSubjectType.COLLECTION_GROUP
-            case "FROM":
-                return FIKLSubjectType.COLLECTION
-            case "AT":
-                return FIKLSubjectType.DOCUMENT
-
-    def _do_select(self, function: Tree | None, subset: Tree, subject_type: Tree,
-                   subject: Tree, where: Tree | None, order: Tree | None,
-                   limit: Tree | None, group: Tree | None,
-                   output: Tree | None, output_format: Tree | None) -> FIKLSelectQuery:
+    def identifier(self, _identified: Token, _by: Token, prop: str) -> str:
+        """Gets the identifier that is specified in the query."""
+        return prop
+
+    def collection_type(self, token: Token) -> FIKLSubjectType:
+        """Gets the collection subject type that the query is referring to."""
+        return _SUBJECT_TYPES[token.type]
+
+    def document_type(self, token: Token) -> FIKLSubjectType:
+        """Gets the document subject type that the query is referring to."""
+        return _SUBJECT_TYPES[token.type]
+
+    def _do_select(self, function: str | None, subset: tuple[str, ...] | str,
+                   subject_type: FIKLSubjectType, subject: str,
+                   where: tuple[FIKLWhere, ...] | None, order: tuple[FIKLOrderBy, ...] | None,
+                   limit: int | None, group: str | None,
+                   output: tuple[FIKLOutputType, str | None] | None,
+                   output_format: FIKLFormatType | None) -> FIKLSelectQuery:
         """
         The base method for all select queries.
         Creates the appropate definition of the select query.
         """
-        return {
-            "query_type": FIKLQueryType.SELECT,
-            "fields": self._as_fields(subset),
-            "subject": self._as_value(subject),
-            "subject_type": self._as_subject_type(subject_type),
-            "where": self._as_where(where),
-            "limit": self._as_limit(limit),
-            "order": self._as_order(order),
-            "group": self._as_group(group),
-            "output": self._as_output(output),
-            "output_type": self._as_output_type(output),
-            "format": self._as_format(output_format),
-            "function": self._as_function(function)
-        }
-
-    def select_collection(self, function: Tree | None, subset: Tree, subject_type: Tree,
-                          subject: Tree, where: Tree | None, order: Tree,
-                          limit: Tree | None, group: Tree | None,
-                          output_format: Tree | None, output: Tree | None):
+        output_type, output_path = (None, None) if output is None else output
+        return FIKLSelectQuery(
+            query_type=FIKLQueryType.SELECT,
+            fields=subset,
+            subject=subject,
+            subject_type=subject_type,
+            where=where,
+            limit=limit,
+            order=order,
+            group=group,
+            output=output_path,
+            output_type=output_type,
+            format=output_format,
+            function=function
+        )
+
+    def select_collection(self, function: str | None, subset: tuple[str, ...] | str,
+                          subject_type: FIKLSubjectType, subject: str,
+                          where: tuple[FIKLWhere, ...] | None,
+                          order: tuple[FIKLOrderBy, ...] | None,
+                          limit: int | None, group: str | None,
+                          output_format: FIKLFormatType | None,
+                          output: tuple[FIKLOutputType, str | None] | None):
         """The method for all select collection queries."""
         return self._do_select(function, subset, subject_type, subject,
                                where, order, limit, group, output, output_format)
 
-    def select_document(self, subset: Tree, subject_type: Tree,
-                        subject: Tree, output_format: Tree | None,
-                        output: Tree | None):
+    def select_document(self, subset: tuple[str, ...] | str, subject_type: FIKLSubjectType,
+                        subject: str, output_format: FIKLFormatType | None,
+                        output: tuple[FIKLOutputType, str | None] | None):
         """The method for all select document queries."""
         return self._do_select(None, subset, subject_type, subject,
                                where=None, order=None, limit=None, group=None,
                                output=output, output_format=output_format)
 
-    def _do_update(self, subject_type: Tree, subject: Tree, setter: Tree, where: Tree | None):
+    def _do_update(self, subject_type: FIKLSubjectType, subject: str,
+                   setters: tuple[FIKLUpdateSet, ...],
+                   where: tuple[FIKLWhere, ...] | None) -> FIKLUpdateQuery:
         """
         The base method for all update queries.
         Creates the appropate definition of the update query.
         """
 
-        return {
-            "query_type": FIKLQueryType.UPDATE,
-            "subject": self._as_value(subject),
-            "subject_type": self._as_subject_type(subject_type),
-            "where": self._as_where(where),
-            "set": self._as_setters(setter)
-        }
+        return FIKLUpdateQuery(
+            query_type=FIKLQueryType.UPDATE,
+            subject=subject,
+            subject_type=subject_type,
+            where=where,
+            set=setters
+        )
 
-    def update_collection(self, subject_type: Tree, subject: Tree, setter: Tree, where: Tree):
+    def update_collection(self, subject_type: FIKLSubjectType, subject: str,
+                          setters: tuple[FIKLUpdateSet, ...], where: tuple[FIKLWhere, ...]):
         """The method for all update collection queries."""
-        return self._do_update(subject_type, subject, setter, where)
+        return self._do_update(subject_type, subject, setters, where)
 
-    def update_document(self, subject_type: Tree, subject: Tree, setter: Tree):
+    def update_document(self, subject_type: FIKLSubjectType, subject: str,
+                        setters: tuple[FIKLUpdateSet, ...]):
         """The method for all update document queries."""
-        return self._do_update(subject_type, subject, setter, where=None)
+        return self._do_update(subject_type, subject, setters, where=None)
 
-    def _do_delete(self, subject_type: Tree, subject: Tree, where: Tree):
+    def _do_delete(self, subject_type: FIKLSubjectType, subject: str,
+                   where: tuple[FIKLWhere, ...] | None) -> FIKLQuery:
         """
         The base method for all delete queries.
         Creates the appropate definition of the delete query.
         """
-        return {
-            "query_type": FIKLQueryType.DELETE,
-            "subject": self._as_value(subject),
-            "subject_type": self._as_subject_type(subject_type),
-            "where": self._as_where(where)
-        }
-
-    def delete_collection(self, subject_type: Tree, subject: Tree, where: Tree):
+        return FIKLQuery(
+            query_type=FIKLQueryType.DELETE,
+            subject=subject,
+            subject_type=subject_type,
+            where=where
+        )
+
+    def delete_collection(self, subject_type: FIKLSubjectType, subject: str,
+                          where: tuple[FIKLWhere, ...]):
         """The method for all delete collection queries."""
         return self._do_delete(subject_type, subject, where)
 
-    def delete_document(self, subject_type: Tree, subject: Tree):
+    def delete_document(self, subject_type: FIKLSubjectType, subject: str):
         """The method for all delete document queries."""
         return self._do_delete(subject_type, subject, where=None)
 
-    def show_collections(self, subject_type: Tree | None, subject: Tree | None):
+    def show_collections(self, subject_type: FIKLSubjectType | None, subject: str | None):
         """The method for all show collections queries."""
-        has_type = subject_type is not None
-        subject_type = self._as_subject_type(subject_type) if has_type else FIKLSubjectType.DOCUMENT
-        return {
-            "query_type": FIKLQueryType.SHOW,
-            "subject": None if subject is None else self._as_value(subject),
-            "subject_type": subject_type,
-            "where": None
-        }
-
-    def insert_document(self, subject: Tree, setter: Tree, identifier: Tree) -> FIKLInsertQuery:
+        return FIKLQuery(
+            query_type=FIKLQueryType.SHOW,
+            subject=subject,
+            subject_type=FIKLSubjectType.DOCUMENT if subject_type is None else subject_type,
+            where=None
+        )
+
+    def insert_document(self, subject: str, setters: tuple[FIKLUpdateSet, ...],
+                        identifier: str | None) -> FIKLInsertQuery:
         """The method for all insert document queries."""
-        return {
-            "query_type": FIKLQueryType.INSERT,
-            "subject": self._as_value(subject),
-            "subject_type": FIKLSubjectType.COLLECTION,
-            "set": self._as_setters(setter),
-            "identifier": self._as_identifier(identifier)
-        }
+        return FIKLInsertQuery(
+            query_type=FIKLQueryType.INSERT,
+            subject=subject,
+            subject_type=FIKLSubjectType.COLLECTION,
+            where=None,
+            set=setters,
+            identifier=identifier
+        )
+
+
+# FIKLTree holds no state, so a single instance is shared by all parses.
+_TRANSFORMER = FIKLTree()
 
 
 def parse(query: str) -> FIKLQuery:
     """
-    Uses Lark to parse the query against the grammar and then provides a tokenised query
+    Uses Lark to parse the query against the grammar and then provides a tokenised query.
+    Parsed queries are frozen dataclasses that only hold tuples and immutable values,
+    so the result of parsing the same query is shared between callers.
     """
+    return _parse(query.strip())
+
+
+@lru_cache(maxsize=128)
+def _parse(query: str) -> FIKLQuery:
+    """Parses the stripped query. Results are cached by the query text."""
     try:
 
         parse_tree = build_parse_tree(query)
 
-        ql_tree = FIKLTree().transform(parse_tree)
+        ql_tree = _TRANSFORMER.transform(parse_tree)
         fikl_query: FIKLQuery = ql_tree.children[0]
         return fikl_query
-    except Exception as err:
+    except LarkError as err:
         raise QuerySyntaxError(err) from err
 
 
@@ -386,10 +414,21 @@ def build_parse_tree(query: str):
     Returns:
         The Lark Tree that represents the tokenized query.
     """
-    grammar = read_grammar()
+    return _get_parser().parse(query)
+
 
-    parser = Lark(grammar, lexer="basic")
-    return parser.parse(query)
+@lru_cache(maxsize=1)
+def _get_parser() -> Lark:
+    """
+    Builds the LALR parser for the FIKL grammar. The parser is only built once
+    and then reused for all subsequent queries. The grammar is embedded in the
+    package (see embed_grammar) and the parse tables are cached on disk by Lark
+    so that subsequent runs only need to load them.
+
+    Returns:
+        Lark: The parser for the FIKL language.
+    """
+    return Lark(GRAMMAR, parser="lalr", lexer="contextual", cache=True)
 
 
 def resource_path(relative_path):
@@ -417,3 +456,16 @@ def read_grammar():
     """
     with open(resource_path("fikl.lark"), encoding="utf-8") as file:
         return file.read()
+
+
+def embed_grammar():
+    """
+    Writes the contents of the grammar file into lang/_grammar.py so that the
+    parser can be built without reading the grammar file at runtime.
+    This must be run whenever fikl.lark is changed.
+    """
+    module_path = os.path.join(os.path.dirname(__file__), "_grammar.py")
+    with open(module_path, "w", encoding="utf-8") as file:
+        file.write('"""The FIKL grammar, generated from fikl.lark by embed_grammar."""\n')
+        file.write("# lang/_grammar.py\n\n")
+        file.write(f'GRAMMAR = r"""{read_grammar()}"""\n')
@@ -2,6 +2,7 @@
 # pylint: disable=missing-function-docstring,missing-class-docstring,line-too-long,too-many-public-methods
 import unittest
 
+from lang._grammar import GRAMMAR
 from lang.transformer import (parse, read_grammar, build_parse_tree,
                               FIKLQueryType, FIKLSubjectType, FIKLFormatType, QuerySyntaxError)
 
@@ -11,53 +12,70 @@ class TestTransformer(unittest.TestCase):
         grammar = read_grammar()
         self.assertIsNotNone(grammar)
 
+    def test_embedded_grammar_matches_grammar_file(self):
+        self.assertEqual(GRAMMAR, read_grammar())
+
     def test_should_build_parse_tree(self):
         tree = build_parse_tree('select * from SOME_COLLECTION')
         self.assertIsNotNone(tree)
 
+    def test_should_reuse_parsed_query(self):
+        query = parse('select * from SOME_COLLECTION where some_field in [1, 2]')
+        self.assertIs(parse('  select * from SOME_COLLECTION where some_field in [1, 2]\n'), query)
+
+        with self.assertRaises(AttributeError):
+            query.where.append("junk")
+
+        with self.assertRaises(AttributeError):
+            query.where[0].value.append(3)
+
     def test_should_parse_valid_select_with_discint(self):
         query = parse('select count * from SOME_COLLECTION')
-        self.assertEqual(query["function"], "count")
+        self.assertEqual(query.function, "count")
+
+    def test_should_parse_valid_select_with_quoted_group_by(self):
+        query = parse('select * from SOME_COLLECTION group by "some.nested.field"')
+        self.assertEqual(query.group, "some.nested.field")
 
     def test_should_parse_valid_select_with_order_by(self):
         query = parse('select * from SOME_COLLECTION order by some_field desc, last_name asc, first_name')
 
-        self.assertIsNotNone(query["order"])
-        self.assertEqual(len(query["order"]), 3)
+        self.assertIsNotNone(query.order)
+        self.assertEqual(len(query.order), 3)
 
-        self.assertEqual(query["order"][0]["property"], "some_field")
-        self.assertEqual(query["order"][0]["direction"], "desc")
+        self.assertEqual(query.order[0].property, "some_field")
+        self.assertEqual(query.order[0].direction, "desc")
 
-        self.assertEqual(query["order"][2]["property"], "first_name")
-        self.assertEqual(query["order"][2]["direction"], "asc")
+        self.assertEqual(query.order[2].property, "first_name")
+        self.assertEqual(query.order[2].direction, "asc")
 
     def test_should_parse_valid_select_query(self):
         query = parse('select * from SOME_COLLECTION')
-        self.assertEqual(query["query_type"], FIKLQueryType.SELECT)
-        self.assertEqual(query["fields"], "*")
-        self.assertEqual(query["subject_type"], FIKLSubjectType.COLLECTION)
-        self.assertEqual(query["subject"], "SOME_COLLECTION")
-        self.assertIsNone(query["where"])
-        self.assertIsNone(query["limit"])
+        self.assertEqual(query.query_type, FIKLQueryType.SELECT)
+        self.assertEqual(query.fields, "*")
+        self.assertEqual(query.subject_type, FIKLSubjectType.COLLECTION)
+        self.assertEqual(query.subject, "SOME_COLLECTION")
+        self.assertIsNone(query.where)
+        self.assertIsNone(query.limit)
 
     def test_should_parse_valid_select_with_fields_query(self):
         query = parse(
             'select first_field, "some.nested.field" from SOME_COLLECTION')
-        self.assertEqual(query["query_type"], FIKLQueryType.SELECT)
-        self.assertEqual(query["fields"], ["first_field", "some.nested.field"])
-        self.assertEqual(query["subject_type"], FIKLSubjectType.COLLECTION)
-        self.assertEqual(query["subject"], "SOME_COLLECTION")
-        self.assertIsNone(query["where"])
-        self.assertIsNone(query["limit"])
+        self.assertEqual(query.query_type, FIKLQueryType.SELECT)
+        self.assertEqual(query.fields, ("first_field", "some.nested.field"))
+        self.assertEqual(query.subject_type, FIKLSubjectType.COLLECTION)
+        self.assertEqual(query.subject, "SOME_COLLECTION")
+        self.assertIsNone(query.where)
+        self.assertIsNone(query.limit)
 
     def test_should_parse_valid_select_with_limit_query(self):
         query = parse('select * from SOME_COLLECTION limit 10')
-        self.assertEqual(query["query_type"], FIKLQueryType.SELECT)
-        self.assertEqual(query["fields"], "*")
-        self.assertEqual(query["subject_type"], FIKLSubjectType.COLLECTION)
-        self.assertEqual(query["subject"], "SOME_COLLECTION")
-        self.assertIsNone(query["where"])
-        self.assertEqual(query["limit"], 10)
+        self.assertEqual(query.query_type, FIKLQueryType.SELECT)
+        self.assertEqual(query.fields, "*")
+        self.assertEqual(query.subject_type, FIKLSubjectType.COLLECTION)
+        self.assertEqual(query.subject, "SOME_COLLECTION")
+        self.assertIsNone(query.where)
+        self.assertEqual(query.limit, 10)
 
     def test_should_parse_valid_select_with_limit_and_where_query(self):
         query = parse("""
@@ -65,16 +83,16 @@ class TestTransformer(unittest.TestCase):
                       where some_field == "ABDEFG" and some_other_field == 2000 limit 10
         """)
 
-        self.assertIsNotNone(query["where"])
-        self.assertEqual(len(query["where"]), 2)
+        self.assertIsNotNone(query.where)
+        self.assertEqual(len(query.where), 2)
 
-        self.assertEqual(query["where"][0]["property"], "some_field")
-        self.assertEqual(query["where"][0]["operator"], "==")
-        self.assertEqual(query["where"][0]["value"], "ABDEFG")
+        self.assertEqual(query.where[0].property, "some_field")
+        self.assertEqual(query.where[0].operator, "==")
+        self.assertEqual(query.where[0].value, "ABDEFG")
 
-        self.assertEqual(query["where"][1]["property"], "some_other_field")
-        self.assertEqual(query["where"][1]["operator"], "==")
-        self.assertEqual(query["where"][1]["value"], 2000)
+        self.assertEqual(query.where[1].property, "some_other_field")
+        self.assertEqual(query.where[1].operator, "==")
+        self.assertEqual(query.where[1].value, 2000)
 
     def test_should_parse_valid_select_and_array_based_where_query(self):
         query = parse("""
@@ -82,32 +100,41 @@ class TestTransformer(unittest.TestCase):
                       where some_field in ["ABDEFG", "HIJKLNOP"]
         """)
 
-        self.assertIsNotNone(query["where"])
-        self.assertEqual(len(query["where"]), 1)
+        self.assertIsNotNone(query.where)
+        self.assertEqual(len(query.where), 1)
+
+        self.assertEqual(query.where[0].property, "some_field")
+        self.assertEqual(query.where[0].operator, "in")
+        self.assertEqual(query.where[0].value, ("ABDEFG", "HIJKLNOP"))
 
-        self.assertEqual(query["where"][0]["property"], "some_field")
-        self.assertEqual(query["where"][0]["operator"], "in")
-        self.assertEqual(query["where"][0]["value"], ["ABDEFG", "HIJKLNOP"])
+    def test_should_parse_valid_select_and_keyword_array_based_where_query(self):
+        query = parse('select * from SOME_COLLECTION where some_field in [true, false, null, 10]')
+
+        self.assertEqual(query.where[0].value, (True, False, None, 10))
+
+    def test_should_parse_hashable_query(self):
+        query = parse('select a, b from SOME_COLLECTION where some_field in [1, 2] order by a')
+        self.assertIsInstance(hash(query), int)
 
     def test_should_parse_valid_document_update(self):
         query = parse("""
             update at "SOME_COLLECTION/DOC_ID"
                       set some_field = "ABC", "some_other_field.nested" = 2000, some_nullable_field = null
         """)
-        self.assertEqual(query["query_type"], FIKLQueryType.UPDATE)
-        self.assertEqual(query["subject_type"], FIKLSubjectType.DOCUMENT)
+        self.assertEqual(query.query_type, FIKLQueryType.UPDATE)
+        self.assertEqual(query.subject_type, FIKLSubjectType.DOCUMENT)
 
-        self.assertIsNotNone(query["set"])
-        self.assertEqual(len(query["set"]), 3)
+        self.assertIsNotNone(query.set)
+        self.assertEqual(len(query.set), 3)
 
-        self.assertEqual(query["set"][0]["property"], "some_field")
-        self.assertEqual(query["set"][0]["value"], "ABC")
+        self.assertEqual(query.set[0].property, "some_field")
+        self.assertEqual(query.set[0].value, "ABC")
 
-        self.assertEqual(query["set"][1]["property"], "some_other_field.nested")
-        self.assertEqual(query["set"][1]["value"], 2000)
+        self.assertEqual(query.set[1].property, "some_other_field.nested")
+        self.assertEqual(query.set[1].value, 2000)
 
-        self.assertEqual(query["set"][2]["property"], "some_nullable_field")
-        self.assertEqual(query["set"][2]["value"], None)
+        self.assertEqual(query.set[2].property, "some_nullable_field")
+        self.assertEqual(query.set[2].value, None)
 
 
     def test_should_parse_valid_update_with_local_where_query(self):
@@ -116,10 +143,10 @@ class TestTransformer(unittest.TestCase):
                       where some_field == "ABDEFG" and "and.another.some_other_field"^ == 2000 order by some_strange_field^ desc
         """)
 
-        self.assertFalse(query["where"][0]["local"])
-        self.assertTrue(query["where"][1]["local"])
+        self.assertFalse(query.where[0].local)
+        self.assertTrue(query.where[1].local)
 
-        self.assertTrue(query["order"][0]["local"])
+        self.assertTrue(query.order[0].local)
 
     def test_should_parse_valid_update_with_limit_and_where_query(self):
         query = parse("""
@@ -128,25 +155,25 @@ class TestTransformer(unittest.TestCase):
                       where some_field == "ABDEFG" and some_other_field == 2000
         """)
 
-        self.assertIsNotNone(query["where"])
-        self.assertEqual(len(query["where"]), 2)
+        self.assertIsNotNone(query.where)
+        self.assertEqual(len(query.where), 2)
 
-        self.assertEqual(query["where"][0]["property"], "some_field")
-        self.assertEqual(query["where"][0]["operator"], "==")
-        self.assertEqual(query["where"][0]["value"], "ABDEFG")
+        self.assertEqual(query.where[0].property, "some_field")
+        self.assertEqual(query.where[0].operator, "==")
+        self.assertEqual(query.where[0].value, "ABDEFG")
 
-        self.assertEqual(query["where"][1]["property"], "some_other_field")
-        self.assertEqual(query["where"][1]["operator"], "==")
-        self.assertEqual(query["where"][1]["value"], 2000)
+        self.assertEqual(query.where[1].property, "some_other_field")
+        self.assertEqual(query.where[1].operator, "==")
+        self.assertEqual(query.where[1].value, 2000)
 
-        self.assertIsNotNone(query["set"])
-        self.assertEqual(len(query["set"]), 2)
+        self.assertIsNotNone(query.set)
+        self.assertEqual(len(query.set), 2)
 
-        self.assertEqual(query["set"][0]["property"], "some_field")
-        self.assertEqual(query["set"][0]["value"], "ABC")
+        self.assertEqual(query.set[0].property, "some_field")
+        self.assertEqual(query.set[0].value, "ABC")
 
-        self.assertEqual(query["set"][1]["property"], "some_other_field")
-        self.assertEqual(query["set"][1]["value"], 2000)
+        self.assertEqual(query.set[1].property, "some_other_field")
+        self.assertEqual(query.set[1].value, 2000)
 
     def test_should_not_parse_update_that_does_not_have_where(self):
         with self.assertRaises(QuerySyntaxError):
@@ -157,78 +184,78 @@ class TestTransformer(unittest.TestCase):
 
     def test_should_parse_valid_select_on_collection_group(self):
         query = parse('select * within SOME_COLLECTION_GROUP limit 10')
-        self.assertEqual(query["query_type"], FIKLQueryType.SELECT)
-        self.assertEqual(query["fields"], "*")
-        self.assertEqual(query["subject_type"],
+        self.assertEqual(query.query_type, FIKLQueryType.SELECT)
+        self.assertEqual(query.fields, "*")
+        self.assertEqual(query.subject_type,
                          FIKLSubjectType.COLLECTION_GROUP)
-        self.assertEqual(query["subject"], "SOME_COLLECTION_GROUP")
-        self.assertIsNone(query["where"])
-        self.assertEqual(query["limit"], 10)
+        self.assertEqual(query.subject, "SOME_COLLECTION_GROUP")
+        self.assertIsNone(query.where)
+        self.assertEqual(query.limit, 10)
 
     def test_should_parse_valid_select_on_document(self):
         query = parse('select * at "SOME_COLLECTION/DOC_ID"')
 
-        self.assertEqual(query["query_type"], FIKLQueryType.SELECT)
-        self.assertEqual(query["fields"], "*")
-        self.assertEqual(query["subject_type"],
+        self.assertEqual(query.query_type, FIKLQueryType.SELECT)
+        self.assertEqual(query.fields, "*")
+        self.assertEqual(query.subject_type,
                          FIKLSubjectType.DOCUMENT)
-        self.assertEqual(query["subject"], "SOME_COLLECTION/DOC_ID")
-        self.assertIsNone(query["where"])
-        self.assertIsNone(query["limit"], 10)
+        self.assertEqual(query.subject, "SOME_COLLECTION/DOC_ID")
+        self.assertIsNone(query.where)
+        self.assertIsNone(query.limit, 10)
 
     def test_should_parse_valid_show_query(self):
         query = parse('show collections')
-        self.assertEqual(query["query_type"], FIKLQueryType.SHOW)
-        self.assertEqual(query["subject_type"], FIKLSubjectType.DOCUMENT)
+        self.assertEqual(query.query_type, FIKLQueryType.SHOW)
+        self.assertEqual(query.subject_type, FIKLSubjectType.DOCUMENT)
 
     def test_should_parse_valid_delete_query(self):
         query = parse('delete from COLLECTION where some_field == 2000')
 
-        self.assertEqual(query["query_type"], FIKLQueryType.DELETE)
-        self.assertEqual(query["subject_type"], FIKLSubjectType.COLLECTION)
+        self.assertEqual(query.query_type, FIKLQueryType.DELETE)
+        self.assertEqual(query.subject_type, FIKLSubjectType.COLLECTION)
 
-        self.assertIsNotNone(query["where"])
-        self.assertEqual(len(query["where"]), 1)
+        self.assertIsNotNone(query.where)
+        self.assertEqual(len(query.where), 1)
 
     def test_should_parse_valid_delete_document_query(self):
         query = parse('delete at "COLLECTION/DOC_ID"')
 
-        self.assertEqual(query["query_type"], FIKLQueryType.DELETE)
-        self.assertEqual(query["subject_type"], FIKLSubjectType.DOCUMENT)
-        self.assertEqual(query["subject"], "COLLECTION/DOC_ID")
+        self.assertEqual(query.query_type, FIKLQueryType.DELETE)
+        self.assertEqual(query.subject_type, FIKLSubjectType.DOCUMENT)
+        self.assertEqual(query.subject, "COLLECTION/DOC_ID")
 
-        self.assertIsNone(query["where"])
+        self.assertIsNone(query.where)
 
     def test_should_parse_valid_show_with_output(self):
         query = parse('select * from COLLECTION where some_field == 2000 format json output "~/output.json"')
 
-        self.assertEqual(query["query_type"], FIKLQueryType.SELECT)
-        self.assertEqual(query["subject_type"], FIKLSubjectType.COLLECTION)
-        self.assertEqual(query["subject"], "COLLECTION")
-        self.assertEqual(query["output"], "~/output.json")
-        self.assertEqual(query["format"], FIKLFormatType.JSON)
+        self.assertEqual(query.query_type, FIKLQueryType.SELECT)
+        self.assertEqual(query.subject_type, FIKLSubjectType.COLLECTION)
+        self.assertEqual(query.subject, "COLLECTION")
+        self.assertEqual(query.output, "~/output.json")
+        self.assertEqual(query.format, FIKLFormatType.JSON)
 
     def test_should_parse_valid_insert(self):
         query = parse('insert into COLLECTION set some_field = 2000, some_other_field = "ABC", "some.nested.field" = "something" identified by "ABCD"')
 
-        self.assertEqual(query["query_type"], FIKLQueryType.INSERT)
-        self.assertEqual(query["subject_type"], FIKLSubjectType.COLLECTION)
-        self.assertEqual(query["subject"], "COLLECTION")
+        self.assertEqual(query.query_type, FIKLQueryType.INSERT)
+        self.assertEqual(query.subject_type, FIKLSubjectType.COLLECTION)
+        self.assertEqual(query.subject, "COLLECTION")
 
-        self.assertIsNotNone(query["set"])
-        self.assertEqual(len(query["set"]), 3)
+        self.assertIsNotNone(query.set)
+        self.assertEqual(len(query.set), 3)
 
-        self.assertEqual(query["set"][0]["property"], "some_field")
-        self.assertEqual(query["set"][0]["value"], 2000)
+        self.assertEqual(query.set[0].property, "some_field")
+        self.assertEqual(query.set[0].value, 2000)
 
-        self.assertEqual(query["set"][1]["property"], "some_other_field")
-        self.assertEqual(query["set"][1]["value"], "ABC")
-        self.assertEqual(query["identifier"], "ABCD")
+        self.assertEqual(query.set[1].property, "some_other_field")
+        self.assertEqual(query.set[1].value, "ABC")
+        self.assertEqual(query.identifier, "ABCD")
 
     def test_should_parse_valid_insert_with_no_identifier(self):
         query = parse('insert into COLLECTION set some_field = 2000, some_other_field = "ABC", "some.nested.field" = "something"')
 
-        self.assertEqual(query["identifier"], None)
+        self.assertEqual(query.identifier, None)
 
     def test_should_not_parse_document_select_that_has_where(self):
         with self.assertRaises(QuerySyntaxError):
@@ -242,6 +269,13 @@ class TestTransformer(unittest.TestCase):
                 delete from SOME_COLLECTION
             """)
 
+    def test_should_not_parse_invalid_escape(self):
+        with self.assertRaises(QuerySyntaxError):
+            parse(r'select * from SOME_COLLECTION where some_field == "\x"')
+
+        with self.assertRaises(QuerySyntaxError):
+            parse(r'select * from "\u12"')
+
     def test_should_not_parse_invalid_select(self):
         with self.assertRaises(QuerySyntaxError):
             parse('select from SOME_COLLECTION')